@@ -1,7 +1,45 @@
 #!/usr/bin/env python
 
+import os
+
 from setuptools import setup
 
+# Modules on the per-token hot path.  When ``WES_COMPILE=cython`` is set in the
+# build environment, these are compiled ahead-of-time into extension modules.
+# The pure-python sources are always installed alongside so that an install
+# without a C toolchain (or without the flag) still works.  The parser isn't
+# included since compiling its untyped code makes it slower, not faster.
+COMPILED_MODULES = [
+    "wes/lexer.py",
+]
+
+# Modules that can be compiled with mypyc when ``WES_COMPILE=mypyc`` is set.
+# The parse tree nodes in ``wes/parser.py`` are built dynamically from their
+# ``__slots__`` by ``SlotClass`` and ``Pattern``, which mypyc's native classes
+# don't support, so only the lexer is compiled.
+MYPYC_MODULES = [
+    "wes/lexer.py",
+]
+
+
+def get_ext_modules():
+    compiler = os.environ.get("WES_COMPILE")
+
+    if compiler == "cython":
+        from Cython.Build import cythonize  # type: ignore
+
+        return cythonize(
+            COMPILED_MODULES,
+            compiler_directives={"language_level": "3"},
+        )
+    elif compiler == "mypyc":
+        from mypyc.build import mypycify  # type: ignore
+
+        return mypycify(MYPYC_MODULES)
+    else:
+        return []
+
+
 extras_require = {
     "test": [
         "pytest>=6.2",
@@ -13,6 +51,10 @@ extras_require = {
         "black>=21.9b0",
         "pyright>=1.1",
     ],
+    "compile": [
+        "cython>=3.0",
+        "mypy>=1.0",
+    ],
     "dev": [
         "ipython>=7.27",
         "ipdb>=0.13",
@@ -34,4 +76,5 @@ setup(
     python_requires=">=3.8",
     extras_require=extras_require,
     packages=["wes"],
+    ext_modules=get_ext_modules(),
 )
@@ -1,8 +1,9 @@
 from io import BytesIO, StringIO
+from typing import Optional
 
 import pytest
 
-from wes.cli import Binary, BinaryText, run
+from wes.cli import Binary, BinaryText, ReadCompiler, run
 from wes.compilers.sap import CompileSap
 from wes.exceptions import Message
 
@@ -92,3 +93,19 @@ def test_run_stop_as_message() -> None:
 
     with pytest.raises(Message):
         run(in_buf, formatter, CompileSap)
+
+
+@pytest.mark.parametrize("n", (-1, -2, None))
+def test_read_compiler_read_all(n: Optional[int]) -> None:
+    reader = ReadCompiler(CompileSap.from_str("1\n2\n3\n"))
+
+    assert reader.read(n) == bytes((1, 2, 3))
+    assert reader.read(n) == b""
+
+
+def test_read_compiler_read_size() -> None:
+    reader = ReadCompiler(CompileSap.from_str("1\n2\n3\n"))
+
+    assert reader.read(2) == bytes((1, 2))
+    assert reader.read(2) == bytes((3,))
+    assert reader.read(2) == b""
@@ -131,6 +131,23 @@ label3: 0
 
         assert check_msg(excinfo.value.msg)
 
+    def test_resolve_relative_offset_error_render(self) -> None:
+        file_txt = "+20: 0"
+        compiler = CompileSap.from_str(file_txt)
+
+        with pytest.raises(Message) as excinfo:
+            compiler.scan()
+
+        assert excinfo.value.render(file_txt) == "\n".join(
+            (
+                "at line 1, col 1:",
+                "+20: 0",
+                "^^^",
+                "",
+                "offset resolves to oversized location '20'",
+            )
+        )
+
     def test_compile_basic(self) -> None:
         expected_output = [
             0b00010100,
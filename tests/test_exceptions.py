@@ -34,6 +34,33 @@ problem here
     # fmt: on
 
 
+def test_rendered_error_render_indented() -> None:
+    file_txt = "start:\n    lda  foo, 1  ; comment\n"
+    toks = tuple(Lexer.from_str(file_txt))
+
+    e = Message("problem here", (toks[4],))
+    # fmt: off
+    assert e.render(file_txt) == """
+at line 2, col 10:
+lda  foo, 1  ; comment
+     ^^^
+
+problem here
+"""[1:-1]
+    # fmt: on
+
+    e = Message("problem here", toks[3:7])
+    # fmt: off
+    assert e.render(file_txt) == """
+at line 2, col 5:
+lda  foo, 1  ; comment
+^^^^^^^^^^^
+
+problem here
+"""[1:-1]
+    # fmt: on
+
+
 def test_rendered_error_render_newline() -> None:
     file_txt = "test line"
     toks = tuple(Lexer.from_str(file_txt))
@@ -2,26 +2,21 @@ from typing import Callable
 
 import pytest
 
-from wes.exceptions import EndOfTokens, Message
-from wes.lexer import DISJOINED, Eof, Lexer, Newline, Text, TokenStream, tokenize
+from wes.exceptions import Message
+from wes.lexer import DISJOINED, Eof, Lexer, Newline, Text, TokenStream
 
 from .utils import Eq
 
 
-def test_tokenize() -> None:
-    assert list(tokenize("")) == []
-    assert list(tokenize("a")) == ["a"]
-    assert list(tokenize("\n")) == ["\n"]
-    assert list(tokenize("a\n")) == ["a", "\n"]
-    assert list(tokenize("\na")) == ["\n", "a"]
-    assert list(tokenize("foo:\nbar")) == ["foo", ":", "\n", "bar"]
-    assert list(tokenize("foo:bar   \n\rbaz\n\n")) == [
-        "foo",
-        ":",
-        "bar",
-        "   \n\r",
-        "baz",
-        "\n\n",
+def test_lexer_whitespace() -> None:
+    assert list(Lexer.from_str("foo:bar   \n\rbaz\n\n")) == [
+        Text("foo", 0, 1, 0),
+        Text(":", 0, 1, 3),
+        Text("bar", 0, 1, 4),
+        Newline(0, 1, 10),
+        Text("baz", 11, 2, 1),
+        Newline(11, 2, 4),
+        Eof(16, 3, 1),
     ]
 
 
@@ -155,7 +150,7 @@ foo 42, 0x2a
 
     toks = TokenStream(Lexer.from_str(text))
     # we can assert internal state, can't we?
-    assert toks.hist == []
+    assert toks.toks == expected
     assert toks.i == 0
 
     actual = [toks.get() for _ in range(len(expected))]
@@ -168,8 +163,22 @@ foo 42, 0x2a
         actual = [toks.get() for _ in range(i, len(expected))]
         assert actual == expected[i:]
 
-    with pytest.raises(EndOfTokens):
-        toks.get()
+    # reading past the end keeps returning the eof token
+    assert toks.get() == expected[-1]
+    assert toks.get() == expected[-1]
+    assert toks.peek(5) == expected[-1]
+
+
+def test_token_stream_line_contains() -> None:
+    toks = TokenStream(Lexer.from_str("add a, (b +\n c)\nout\n"))
+
+    assert toks.line_contains(",")
+    assert toks.line_contains("c")
+    assert not toks.line_contains("out")
+
+    while toks.get().text != ",":
+        pass
+    assert not toks.line_contains(",")
 
 
 @pytest.mark.parametrize(
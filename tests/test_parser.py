@@ -197,6 +197,39 @@ def test_parse_binary() -> None:
     assert file == File((Op("foo", (N("bar"), V(42))),))
 
 
+def test_parser_maybe() -> None:
+    parser = Parser.from_str("foo +\n")
+
+    assert parser.maybe("+", "-") is None
+    assert parser.toks.peek().text == "foo"
+
+    assert parser.maybe() is not None
+    assert parser.maybe("+", "-") is not None
+    assert parser.maybe("+", "-") is None
+    assert parser.expect_newline() is not None
+
+
+def test_parse_node_toks() -> None:
+    parser = Parser.from_str("foo (1 + 2), [bar]")
+    op = cast(Op, parser.parse_file().stmts[0])
+
+    assert [t.text for t in op.toks] == ["foo", "]"]
+    assert [t.text for t in op.args[0].toks] == ["(", ")"]
+    assert [t.text for t in cast(Deref, op.args[1]).expr.toks] == ["bar"]
+
+
+def test_parse_cache_window() -> None:
+    parser = Parser.from_str("foo ~1\nbar ~2\n")
+
+    assert parser.parse_stmt() == Op("foo", (U("~", V(1)),))
+    first_stmt_keys = set(parser.cache)
+    assert len(first_stmt_keys) > 0
+
+    assert parser.parse_stmt() == Op("bar", (U("~", V(2)),))
+    assert len(parser.cache) > 0
+    assert first_stmt_keys.isdisjoint(parser.cache)
+
+
 def test_parser_from_buf() -> None:
     buf = StringIO("foo")
     parser = Parser.from_buf(buf)
@@ -220,6 +253,16 @@ def test_parse_underscore_digit_grouping(int_repr: str, int_val: int) -> None:
     assert file == File((V(int_val),))
 
 
+@pytest.mark.parametrize("int_repr", ("0x_", "1__000", "1_", "0o8", "0X2A"))
+def test_parse_invalid_int(int_repr: str) -> None:
+    parser = Parser.from_str(int_repr)
+
+    with pytest.raises(Stop) as excinfo:
+        parser.parse_file()
+
+    assert "is not a valid name or expression" in excinfo.value.msg
+
+
 def test_parse_const() -> None:
     parser = Parser.from_str("foo = 42")
     file = parser.parse_file()
@@ -296,7 +339,7 @@ def test_invalid_forward_offset_val() -> None:
     parser = Parser.from_str("+foo: 0")
 
     with pytest.raises(Stop) as excinfo:
-        parser.parse_offset()
+        parser.parse_relative()
 
     assert "is not a valid offset" in excinfo.value.msg
 
@@ -305,7 +348,7 @@ def test_invalid_backward_offset_val() -> None:
     parser = Parser.from_str("-foo: 0")
 
     with pytest.raises(Stop) as excinfo:
-        parser.parse_offset()
+        parser.parse_relative()
 
     assert "is not a valid offset" in excinfo.value.msg
 
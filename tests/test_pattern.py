@@ -77,9 +77,52 @@ def test_pattern_hash() -> None:
     assert d[map_t] == "map"
 
 
+class Tagged(Pattern):
+    __slots__ = ("x", "tag")
+
+    annotations = ("tag",)
+
+
+class Loose(Pattern):
+    __slots__ = ("x",)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Loose)
+
+    __hash__ = Pattern.__hash__
+
+
+class LooseSub(Loose):
+    __slots__ = ("y",)
+
+
+class Lenient(Tagged):
+    __slots__ = ("x",)
+
+    def equal(self, p: Pattern) -> bool:
+        return isinstance(p, Lenient)
+
+
 def test_pattern_eq() -> None:
     assert Integer() == Integer()
     assert String() != Integer()
+    assert natural != integer
+    assert integer != natural
+
+    assert Map(string, integer) == Map(string, integer)
+    assert Map(string, string) != Map(string, integer)
+    assert List(integer) != Array(integer, 1)
+
+    # annotations don't take part in equality
+    assert Tagged(integer, tag="a") == Tagged(integer, tag="b")
+    assert Tagged(integer, tag="a") != Tagged(string, tag="a")
+
+    # custom equality is inherited instead of being replaced
+    assert LooseSub.__eq__ is Loose.__eq__
+    assert LooseSub(x=integer, y=string) == Loose(string)
+
+    # a custom `equal` is used instead of a generated `__eq__` from a parent
+    assert Lenient(integer) == Lenient(string)
 
 
 def test_pattern_repr() -> None:
@@ -2,7 +2,14 @@ from typing import Any, Callable
 
 import pytest
 
-from wes.utils import SlotClass, byte_length, le_bytes, serialize_dict, str_to_int
+from wes.utils import (
+    SlotClass,
+    byte_length,
+    le_bytes,
+    parse_int,
+    serialize_dict,
+    str_to_int,
+)
 
 
 def test_str_to_int() -> None:
@@ -13,6 +20,22 @@ def test_str_to_int() -> None:
     assert str_to_int("0042") == 42
 
 
+def test_parse_int() -> None:
+    assert parse_int("0b101010") == 42
+    assert parse_int("0o52") == 42
+    assert parse_int("0x2a") == 42
+    assert parse_int("42") == 42
+    assert parse_int("0042") == 42
+    assert parse_int("0x2_a") == 42
+
+    assert parse_int("foo") is None
+    assert parse_int("0x") is None
+    assert parse_int("0x_") is None
+    assert parse_int("1__0") is None
+    assert parse_int("0X2A") is None
+    assert parse_int("４２") is None
+
+
 def test_byte_length() -> None:
     assert byte_length(2**8 - 1) == 1
     assert byte_length(2**8) == 2
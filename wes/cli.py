@@ -1,8 +1,9 @@
 import argparse
+import itertools
 import shutil
 import sys
 from io import StringIO
-from typing import BinaryIO, Generic, TextIO, Type, TypeVar
+from typing import BinaryIO, Generic, Optional, TextIO, Type, TypeVar
 
 from wes.compiler import Compiler
 from wes.compilers.sap import CompileSap
@@ -32,20 +33,12 @@ class ReadCompiler:
     def __init__(self, compiler: Compiler):
         self.it = iter(compiler)
 
-    def read(self, n: int = -1) -> bytes:
-        bs = []
-
-        try:
-            if n == -1:
-                while True:  # pragma: no cover
-                    bs.append(next(self.it))
-            else:
-                for _ in range(n):
-                    bs.append(next(self.it))
-        except StopIteration:
-            pass
-
-        return bytes(bs)
+    def read(self, n: Optional[int] = -1) -> bytes:
+        # like other file-like objects, read everything if no size is given
+        if n is None or n < 0:
+            return bytes(self.it)
+        else:
+            return bytes(itertools.islice(self.it, n))
 
 
 class Binary(Formatter[BinaryIO]):
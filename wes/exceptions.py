@@ -47,24 +47,28 @@ class Message(Exception):
         return file_txt[line_start:line_end]
 
     def render(self, file_txt: str) -> str:
-        from wes.lexer import Eof, Newline, Text
+        from wes.lexer import EOF, NEWLINE, TEXT
 
         fst, lst = self.toks[0], self.toks[-1]
-        line = self._get_line(file_txt, fst.line_start).strip()
+        raw_line = self._get_line(file_txt, fst.line_start)
+        line = raw_line.strip()
 
-        marker_start = min(len(line), fst.col)
+        # token columns are relative to the unstripped line
+        indent = len(raw_line) - len(raw_line.lstrip())
+
+        marker_start = min(len(line), fst.col - indent)
         if len(self.toks) == 1:
-            if isinstance(fst, Text):
+            if fst.kind == TEXT:
                 marker_len = len(fst.text)
-            elif isinstance(fst, (Newline, Eof)):
+            elif fst.kind in (NEWLINE, EOF):
                 marker_len = 1
             else:  # pragma: no cover
                 raise Exception("invariant")
         else:
-            if isinstance(lst, Text):
-                marker_end = lst.col + len(lst.text)
-            elif isinstance(lst, (Newline, Eof)):
-                marker_end = min(len(line), lst.col)
+            if lst.kind == TEXT:
+                marker_end = lst.col - indent + len(lst.text)
+            elif lst.kind in (NEWLINE, EOF):
+                marker_end = min(len(line), lst.col - indent)
             else:  # pragma: no cover
                 raise Exception("invariant")
             marker_len = max(1, marker_end - marker_start)
@@ -82,10 +86,6 @@ at line {fst.line_num}, col {fst.col + 1}:
         # fmt: on
 
 
-class EndOfTokens(Exception):
-    pass
-
-
 class PatternError(Exception):
     """
     Indicates an error occurred in a method of the ``Pattern`` class or while
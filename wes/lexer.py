@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import re
 from io import StringIO
-from typing import Any, Callable, Iterator, List, TextIO
+from sys import intern
+from typing import Any, ClassVar, Iterator, List, Optional, TextIO
 
-from wes.exceptions import EndOfTokens, Message
+from wes.exceptions import Message
+from wes.utils import parse_int
 
 COMMENT_CHR = ";"
 
@@ -11,93 +14,72 @@ COMMENT_CHR = ";"
 DISJOINED = "-~+/^&|%:,[]()"
 
 
-def _char_type(c: str) -> Any:
-    """
-    Helper function for the low-level tokenizer.  All that matters is that this
-    function outputs values that are considered different by the equality
-    operator for different character regions.
-    """
-    if c.isspace():
-        return 0
-    elif c == "*":
-        return 1
-    elif c == "<":
-        return 2
-    elif c == ">":
-        return 3
-    elif c == "=":
-        return 4
-    elif c in DISJOINED:
-        return float("nan")
-    else:
-        return 5
-
-
-def tokenize(s: str, *, split_f: Callable[[str], Any] = _char_type) -> Iterator[str]:
-    """
-    Split a string into regions of differing character types.
-    """
-    if len(s) == 0:
-        return
-
-    last_pos = 0
-    last_type = split_f(s[0])
-    i = 1
-
-    while i < len(s):
-        curr_type = split_f(s[i])
-        if curr_type != last_type:
-            yield s[last_pos:i]
-            last_pos = i
+_disjoined = re.escape(DISJOINED)
+
+# Splits source text into regions of differing character types.  Runs of "*",
+# "<", ">", "=", and of all other non-whitespace characters are each grouped
+# into a single token.  Disjoined characters are always separate tokens.
+# Whitespace and comments are matched so that they can be skipped but aren't
+# captured by any group.
+TOKEN_RE = re.compile(
+    "|".join(
+        (
+            r"(\n)",
+            r"[^\S\n]+",
+            re.escape(COMMENT_CHR) + r"[^\n]*",
+            rf"(\*+|<+|>+|=+|[{_disjoined}]|[^\s*<>={_disjoined}]+)",
+        )
+    )
+)
+NEWLINE_GROUP, TEXT_GROUP = 1, 2
 
-        last_type = curr_type
-        i += 1
 
-    yield s[last_pos:]
+# token kinds
+TEXT, NEWLINE, EOF = range(3)
 
 
 class Token:
-    __slots__ = ("line_start", "line_num", "col")
+    __slots__ = ("text", "val", "line_start", "line_num", "col")
+
+    # Set by each token type.  The parser dispatches on this instead of making
+    # `isinstance` checks.
+    kind: ClassVar[int]
 
+    text: str
+    # value of the token text if it's an integer literal.  Computed once here
+    # since the parser may examine the same token several times.
+    val: Optional[int]
     line_start: int
     line_num: int
     col: int
 
     def __init__(
         self,
+        text: str,
         line_start: int,
         line_num: int,
         col: int,
     ):
+        self.text = text
+        self.val = parse_int(text) if text and "0" <= text[0] <= "9" else None
+
         self.line_start = line_start
         self.line_num = line_num
         self.col = col
 
     def __eq__(self, other: Any) -> bool:
         return type(self) is type(other) and (
-            self.line_start == other.line_start
+            self.text == other.text
+            and self.line_start == other.line_start
             and self.line_num == other.line_num
             and self.col == other.col
         )
 
 
 class Text(Token):
-    __slots__ = ("text",)
+    __slots__ = ()
 
-    text: str
-
-    def __init__(
-        self,
-        text: str,
-        line_start: int,
-        line_num: int,
-        col: int,
-    ):
-        self.text = text
-
-        self.line_start = line_start
-        self.line_num = line_num
-        self.col = col
+    kind = TEXT
 
     def __repr__(self) -> str:  # pragma: no cover
         return (
@@ -109,40 +91,43 @@ class Text(Token):
             ")"
         )
 
-    def __eq__(self, other: Any) -> bool:
-        return type(self) is type(other) and (
-            self.text == other.text
-            and self.line_start == other.line_start
-            and self.line_num == other.line_num
-            and self.col == other.col
-        )
 
+class Marker(Token):
+    """
+    A token with no text which marks a position in the source such as the end
+    of a line.  Since its text is empty, the parser can compare the text of any
+    token against operators or punctuation without checking its kind first.
+    """
 
-class Newline(Token):
-    def __repr__(self) -> str:  # pragma: no cover
-        return f"Newline({self.line_start}, {self.line_num}, {self.col})"
+    __slots__ = ()
 
+    def __init__(self, line_start: int, line_num: int, col: int):
+        super().__init__("", line_start, line_num, col)
 
-class Eof(Token):
     def __repr__(self) -> str:  # pragma: no cover
-        return f"Eof({self.line_start}, {self.line_num}, {self.col})"
+        return f"{type(self).__name__}({self.line_start}, {self.line_num}, {self.col})"
 
 
-class LexerError(Exception):
-    pass
+class Newline(Marker):
+    __slots__ = ()
+
+    kind = NEWLINE
+
+
+class Eof(Marker):
+    __slots__ = ()
 
+    kind = EOF
 
-class EndOfBuffer(Exception):
+
+class LexerError(Exception):
     pass
 
 
 class Lexer:
-    __slots__ = ("buf", "line_num", "pos", "delims")
+    __slots__ = ("src", "delims")
 
-    buf: TextIO
-
-    line_num: int
-    pos: int
+    src: str
     delims: List[Text]
 
     DELIM_PAIRS = {
@@ -151,10 +136,7 @@ class Lexer:
     }
 
     def __init__(self, buf: TextIO):
-        self.buf = buf
-
-        self.line_num = 0
-        self.pos = 0
+        self.src = buf.read()
         self.delims = []
 
     def push_delim(self, tok: Text) -> None:
@@ -179,61 +161,31 @@ class Lexer:
         buf = StringIO(text)
         return cls(buf)
 
-    def get_line(self) -> str:
-        line = self.buf.readline()
-        if len(line) == 0:
-            raise EndOfBuffer()
-
-        self.line_num += 1
-        return line
-
     def __iter__(self) -> Iterator[Token]:
-        line = None
-
-        while True:
-            # skip over empty lines and comment lines
-            while True:
-                try:
-                    line = self.get_line()
-                except EndOfBuffer:
-                    if line is None:
-                        line = ""
-
-                    if len(self.delims) > 0:
-                        tok = self.delims[-1]
-                        raise Message(
-                            f"unmatched opening delimiter '{tok.text}'",
-                            (tok,),
-                        )
-                    yield Eof(
-                        self.pos - len(line),
-                        self.line_num,
-                        # `line` here is the previous line since the expression
-                        # to the right of the assignment operator raised an
-                        # exception
-                        len(line),
-                    )
-                    return
-
-                stripped = line.strip()
-                is_empty_line = len(stripped) == 0 or stripped.startswith(COMMENT_CHR)
-
-                if not is_empty_line:
-                    break
-
-                self.pos += len(line)
-
-            col = 0
-            for part in tokenize(line):
-                if part.isspace():
-                    col += len(part)
-                    continue
-                elif part.startswith(COMMENT_CHR):
-                    # We've hit a comment.  No more tokens coming from this
-                    # line.
-                    break
-
-                tok = Text(part, self.pos, self.line_num, col)
+        """
+        Scan the source text in a single pass with ``TOKEN_RE``.
+        """
+        src = self.src
+        src_len = len(src)
+
+        line_num = 1
+        line_start = 0
+        has_toks = False
+
+        for m in TOKEN_RE.finditer(src):
+            group = m.lastindex
+            if group is None:
+                # whitespace or comment
+                continue
+
+            pos = m.start()
+
+            if group == TEXT_GROUP:
+                # Mnemonics, names, and operators repeat often.  Interning them
+                # lets later string comparisons and dict lookups short circuit
+                # on identity.
+                part = intern(m.group(TEXT_GROUP))
+                tok = Text(part, line_start, line_num, pos - line_start)
 
                 if part in ("[", "("):
                     self.push_delim(tok)
@@ -241,49 +193,83 @@ class Lexer:
                     self.pop_delim(tok)
 
                 yield tok
-                col += len(part)
+                has_toks = True
+            elif group == NEWLINE_GROUP:
+                # no semantic newline for empty lines, comment lines, or if
+                # we're inside of delimiters
+                if has_toks and len(self.delims) == 0:
+                    yield Newline(line_start, line_num, pos - line_start)
+                has_toks = False
+
+                if pos + 1 == src_len:
+                    # trailing newline doesn't begin another line
+                    break
+
+                line_start = pos + 1
+                line_num += 1
+
+        if has_toks and len(self.delims) == 0:
+            yield Newline(line_start, line_num, src_len - line_start)
+
+        if len(self.delims) > 0:
+            tok = self.delims[-1]
+            raise Message(f"unmatched opening delimiter '{tok.text}'", (tok,))
 
-            # no semantic newline if we're inside of delimiters
-            if len(self.delims) == 0:
-                yield Newline(
-                    self.pos,
-                    self.line_num,
-                    len(line) - 1 if line[-1] == "\n" else len(line),
-                )
+        if src_len == 0:
+            line_num = 0
 
-            self.pos += len(line)
+        yield Eof(line_start, line_num, src_len - line_start)
 
 
 class TokenStream:
-    __slots__ = ("toks", "hist", "i")
+    __slots__ = ("toks", "i")
 
-    toks: Iterator[Token]
-    hist: List[Token]
+    toks: List[Token]
     i: int
 
     def __init__(self, lexer: Lexer):
-        self.toks = iter(lexer)
-        self.hist = []
+        # The source is lexed up front so that marking and resetting a
+        # position in the stream is just a matter of saving and restoring an
+        # index.  The last token is always an `Eof`, which is also returned for
+        # any position past the end of the stream.
+        self.toks = list(lexer)
         self.i = 0
 
-    def peek(self) -> Token:
-        if self.i < len(self.hist):
-            tok = self.hist[self.i]
-        else:
-            try:
-                tok = next(self.toks)
-            except StopIteration:
-                raise EndOfTokens("end of tokens")
-            self.hist.append(tok)
-
-        return tok
+    def peek(self, n: int = 0) -> Token:
+        """
+        Return the token ``n`` positions ahead of the current position without
+        consuming any tokens.
+        """
+        try:
+            return self.toks[self.i + n]
+        except IndexError:
+            return self.toks[-1]
 
     def get(self) -> Token:
-        tok = self.peek()
-        self.i += 1
+        i = self.i
+        try:
+            tok = self.toks[i]
+        except IndexError:
+            return self.toks[-1]
+        self.i = i + 1
 
         return tok
 
+    def line_contains(self, text: str) -> bool:
+        """
+        Return ``True`` if a token with the text ``text`` appears between the
+        current position and the end of the line.
+        """
+        toks = self.toks
+        for i in range(self.i, len(toks)):
+            tok = toks[i]
+            if tok.kind != TEXT:
+                return False
+            if tok.text == text:
+                return True
+
+        return False
+
     def mark(self) -> int:
         return self.i
 
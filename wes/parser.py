@@ -12,15 +12,13 @@ https://github.com/python/cpython/blob/330f1d58282517bdf1f19577ab9317fa9810bf95/
 """
 from __future__ import annotations
 
-import contextlib
 import functools
+import itertools
 import operator
-import re
 from typing import (
     Any,
     Callable,
     Dict,
-    Iterator,
     Optional,
     TextIO,
     Tuple,
@@ -31,22 +29,29 @@ from typing import (
 )
 
 from wes.exceptions import Message, Reset, Stop
-from wes.lexer import Eof, Lexer, Newline, Text, TokenStream
+from wes.lexer import EOF, NEWLINE, TEXT, Lexer, Token, TokenStream
 from wes.pattern import Pattern
-from wes.utils import serialize_dict, str_to_int
-
-NAME_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
-VAL_RE = re.compile(r"^(0b[01_]+|0o[0-7_]+|[0-9][0-9_]*|0x[a-fA-F0-9_]+)$")
 
 T = TypeVar("T")
 
 
+def _is_name(text: str) -> bool:
+    """
+    Return ``True`` if ``text`` is a valid name i.e. it matches
+    ``[a-zA-Z_][a-zA-Z0-9_]*``.
+    """
+    return text.isidentifier() and text.isascii()
+
+
 class Node(Pattern):
     __slots__ = ("toks",)
 
     annotations = ("toks",)
 
-    toks: Tuple[Text, ...]  # type: ignore
+    # Nodes don't copy the tokens of their children.  They only keep the
+    # tokens needed to point at them in error messages, which are usually just
+    # the first and last.
+    toks: Tuple[Token, ...]  # type: ignore
 
     def __init__(self, *args: Any, **kwargs: Any):
         kwargs.setdefault("toks", ())
@@ -109,6 +114,21 @@ BIN_OPS = {
     "**": operator.pow,
 }
 
+# Precedences of the left-associative binary operators.  Higher numbers bind
+# more tightly.  The right-associative "**" is handled by `parse_power`.
+BIN_OP_PRECS = {
+    "|": 1,
+    "^": 2,
+    "&": 3,
+    "<<": 4,
+    ">>": 4,
+    "+": 5,
+    "-": 5,
+    "*": 6,
+    "/": 6,
+    "%": 6,
+}
+
 
 class Expr(Node):
     __slots__ = tuple()
@@ -183,67 +203,52 @@ class BinExpr(Expr):
 
 def optional(method: Callable[[Parser], T]) -> Callable[[Parser], Optional[T]]:
     @functools.wraps(method)
-    def new_method(self) -> Optional[T]:
-        res = None
-        with self.reset():
-            res = method(self)
+    def new_method(self: Parser) -> Optional[T]:
+        pos = self.toks.mark()
+        try:
+            return method(self)
+        except Reset as e:
+            self.last_reset = e
+            self.toks.reset(pos)
 
-        return res
+        return None
 
     return new_method
 
 
 U = TypeVar("U", bound=Node)
 
+# Memoized parser methods are each assigned a small integer id.  Cache keys
+# pack the token position and this id into a single integer, which is cheaper
+# to hash and compare than a tuple.
+METHOD_ID_BITS = 8
+_method_ids = itertools.count()
 
-def cache_result(
-    method: Callable[..., Optional[U]]
-) -> Callable[..., Optional[U]]:  # pragma: no cover
-    @functools.wraps(method)
-    def new_method(self: Parser, *args: Any, **kwargs: Any) -> Optional[U]:
-        key = (self.toks.mark(), method, args, serialize_dict(kwargs))
 
-        if key in self.cache:
-            res, end = self.cache[key]
-            self.toks.reset(end)
-        else:
-            res = method(self, *args, **kwargs)
-            end = self.toks.mark()
-            self.cache[key] = res, end
+def _new_method_id() -> int:
+    method_id = next(_method_ids)
+    if method_id >= 1 << METHOD_ID_BITS:  # pragma: no cover
+        raise Exception("too many memoized parser methods")
 
-        return cast(Optional[U], res)
+    return method_id
 
-    return new_method
 
+def cache_result(
+    method: Callable[[Parser], Optional[U]]
+) -> Callable[[Parser], Optional[U]]:
+    method_id = _new_method_id()
 
-def cache_left_rec(method: Callable[..., Optional[U]]) -> Callable[..., Optional[U]]:
     @functools.wraps(method)
-    def new_method(self: Parser, *args: Any, **kwargs: Any) -> Optional[U]:
-        pos = self.toks.mark()
-        key = (pos, method, args, serialize_dict(kwargs))
+    def new_method(self: Parser) -> Optional[U]:
+        key = self.toks.mark() << METHOD_ID_BITS | method_id
 
         if key in self.cache:
             res, end = self.cache[key]
             self.toks.reset(end)
         else:
-            # prime cache with failure result
-            last_res, last_pos = None, pos
-            self.cache[key] = last_res, last_pos
-
-            # loop until no longer parse result is obtained
-            while True:
-                self.toks.reset(pos)
-                res = method(self, *args, **kwargs)
-
-                end = self.toks.mark()
-                if end <= last_pos:
-                    break
-
-                last_res, last_pos = res, end
-                self.cache[key] = last_res, last_pos
-
-            res = last_res
-            self.toks.reset(last_pos)
+            res = method(self)
+            end = self.toks.mark()
+            self.cache[key] = res, end
 
         return cast(Optional[U], res)
 
@@ -251,11 +256,8 @@ def cache_left_rec(method: Callable[..., Optional[U]]) -> Callable[..., Optional
 
 
 Pos = int
-ParserMethod = Callable[..., Any]
-Args = Tuple[Any, ...]
-Kwargs = Tuple[Tuple[str, Any], ...]
 
-CacheKey = Tuple[Pos, ParserMethod, Args, Kwargs]
+CacheKey = int
 CacheValue = Tuple[Optional[Node], Pos]
 
 
@@ -281,19 +283,10 @@ class Parser:
         lexer = Lexer(buf)
         return cls(lexer)
 
-    @contextlib.contextmanager
-    def reset(self) -> Iterator[None]:
-        pos = self.toks.mark()
-        try:
-            yield
-        except Reset as e:
-            self.last_reset = e
-            self.toks.reset(pos)
-
-    def expect(self, *alts: str, error: Type[Exception] = Reset) -> Text:
+    def expect(self, *alts: str, error: Type[Exception] = Reset) -> Token:
         tok = self.toks.get()
 
-        if not isinstance(tok, Text):
+        if tok.kind != TEXT:
             raise error("unexpected end of line", (tok,))
         if len(alts) > 0 and tok.text not in alts:
             if len(alts) == 1:
@@ -303,42 +296,73 @@ class Parser:
 
         return tok
 
-    def expect_newline(self, error: Type[Exception] = Reset) -> Newline:
+    def expect_newline(self, error: Type[Exception] = Reset) -> Token:
         tok = self.toks.get()
 
-        if not isinstance(tok, Newline):
+        if tok.kind != NEWLINE:
             raise error("expected end of line", (tok,))
 
         return tok
 
-    def maybe(self, *alts: str) -> Optional[Text]:
-        res = None
-        with self.reset():
-            res = self.expect(*alts)
+    def skip_newline(self) -> None:
+        """
+        Consume the next token if it's a newline.
+        """
+        if self.toks.peek().kind == NEWLINE:
+            self.toks.get()
+
+    def maybe(self, *alts: str) -> Optional[Token]:
+        """
+        Consume and return the next token if it's one of ``alts``.  Token texts
+        are interned by the lexer so these comparisons are mostly identity
+        checks.
+        """
+        tok = self.toks.peek()
+
+        if tok.kind == TEXT and (len(alts) == 0 or tok.text in alts):
+            return self.toks.get()
 
-        return res
+        return None
 
     def parse_file(self) -> File:
-        stmts = []
-        while stmt := self.parse_stmt():
-            stmts.append(stmt)
+        stmts = tuple(iter(self.parse_stmt, None))
 
         tok = self.toks.get()
-        if not isinstance(tok, Eof):
+        if tok.kind != EOF:
             if self.last_reset is None:  # pragma: no cover
                 raise Exception("invariant")
 
             raise Stop(self.last_reset.msg, self.last_reset.toks) from self.last_reset
 
-        return File(tuple(stmts))
+        return File(stmts)
 
     def parse_stmt(self) -> Optional[Union[Stmt, Expr]]:
-        if const := self.parse_const():
-            return const
-        if offset := self.parse_offset():
-            return offset
-        elif label := self.parse_label():
-            return label
+        # The parser never backtracks past the start of a statement so results
+        # memoized for earlier statements will never be looked up again.
+        # Dropping them keeps the cache limited to a window of one statement.
+        self.cache.clear()
+
+        # Look at the first few tokens of the statement to skip alternatives
+        # that are certain to fail before they produce an error.  The order in
+        # which the remaining alternatives are tried is unchanged.
+        fst = self.toks.peek()
+        if fst.kind != TEXT:
+            return self.parse_inst()
+
+        snd = self.toks.peek(1)
+        if snd.text == "=":
+            if const := self.parse_const():
+                return const
+        if fst.text in ("+", "-") and self.toks.peek(2).text == ":":
+            if offset := self.parse_relative():
+                return offset
+        if snd.text == ":":
+            # only integer literals can be absolute offsets
+            if fst.val is not None:
+                if offset := self.parse_absolute():
+                    return offset
+            if label := self.parse_label():
+                return label
         return self.parse_inst()
 
     @optional
@@ -346,7 +370,7 @@ class Parser:
         name = self.expect()
         eq = self.expect("=")
 
-        if not NAME_RE.match(name.text):
+        if not _is_name(name.text):
             raise Stop(f"{repr(name.text)} is not a valid name", (name,))
 
         val = self.parse_expr()
@@ -355,13 +379,7 @@ class Parser:
 
         self.expect_newline()
 
-        return Const(name.text, val, toks=(name, eq) + val.toks)
-
-    def parse_offset(self) -> Optional[Offset]:
-        if off := self.parse_relative():
-            return off
-        else:
-            return self.parse_absolute()
+        return Const(name.text, val, toks=(name, val.toks[-1]))
 
     @optional
     def parse_relative(self) -> Offset:
@@ -369,48 +387,54 @@ class Parser:
         val = self.expect()
         colon = self.expect(":")
 
-        if not VAL_RE.match(val.text):
+        offset = val.val
+        if offset is None:
             raise Stop(f"{repr(val.text)} is not a valid offset", (val,))
 
-        # optional trailing newline
-        with self.reset():
-            self.expect_newline()
+        self.skip_newline()
 
-        return Offset(str_to_int(val.text), relative.text, toks=(relative, val, colon))
+        return Offset(offset, relative.text, toks=(relative, val, colon))
 
     @optional
     def parse_absolute(self) -> Offset:
         val = self.expect()
         colon = self.expect(":")
 
-        if not VAL_RE.match(val.text):
+        offset = val.val
+        if offset is None:
             raise Reset(f"{repr(val.text)} is not a valid offset", (val,))
 
-        # optional trailing newline
-        with self.reset():
-            self.expect_newline()
+        self.skip_newline()
 
-        return Offset(str_to_int(val.text), None, toks=(val, colon))
+        return Offset(offset, None, toks=(val, colon))
 
     @optional
     def parse_label(self) -> Label:
         name = self.expect()
         colon = self.expect(":")
 
-        if not NAME_RE.match(name.text):
+        if not _is_name(name.text):
             raise Stop(f"{repr(name.text)} is not a valid name or offset", (name,))
 
-        # optional trailing newline
-        with self.reset():
-            self.expect_newline()
+        self.skip_newline()
 
         return Label(name.text, toks=(name, colon))
 
     def parse_inst(self) -> Union[Op, Expr, None]:
-        if nullary := self.parse_nullary():
-            return nullary
-        elif unary := self.parse_unary():
-            return unary
+        # A name followed by text that can't continue an expression must be a
+        # mnemonic, so a nullary instruction would fail at the end of line
+        # check.  Skip trying to parse one in that case.
+        fst, snd = self.toks.peek(), self.toks.peek(1)
+        if not (_is_name(fst.text) and snd.kind == TEXT and snd.text not in BIN_OPS):
+            if nullary := self.parse_nullary():
+                return nullary
+
+        # An expression can never contain a comma so a unary instruction would
+        # fail at the end of line check if the line has one.
+        if not self.toks.line_contains(","):
+            if unary := self.parse_unary():
+                return unary
+
         return self.parse_binary()
 
     @optional
@@ -423,7 +447,7 @@ class Parser:
     @optional
     def parse_unary(self) -> Op:
         mnemonic = self.expect()
-        if not NAME_RE.match(mnemonic.text):
+        if not _is_name(mnemonic.text):
             raise Reset(
                 f"'{mnemonic.text}' is not a valid name or expression", (mnemonic,)
             )
@@ -436,12 +460,12 @@ class Parser:
 
         self.expect_newline()
 
-        return Op(mnemonic.text, (arg,), toks=(mnemonic,) + arg.toks)
+        return Op(mnemonic.text, (arg,), toks=(mnemonic, arg.toks[-1]))
 
     @optional
     def parse_binary(self) -> Op:
         mnemonic = self.expect()
-        if not NAME_RE.match(mnemonic.text):
+        if not _is_name(mnemonic.text):
             raise Reset(
                 f"'{mnemonic.text}' is not a valid name or expression", (mnemonic,)
             )
@@ -460,8 +484,7 @@ class Parser:
 
         self.expect_newline(error=Stop)
 
-        toks = (mnemonic,) + arg1.toks + (comma,) + arg2.toks
-        return Op(mnemonic.text, (arg1, arg2), toks=toks)
+        return Op(mnemonic.text, (arg1, arg2), toks=(mnemonic, arg2.toks[-1]))
 
     @optional
     def parse_atom(self) -> Expr:
@@ -473,8 +496,7 @@ class Parser:
                 )
             r_bracket = self.expect("]", error=Stop)
 
-            toks = (l_bracket,) + expr.toks + (r_bracket,)
-            return Deref(expr, toks=toks)
+            return Deref(expr, toks=(l_bracket, r_bracket))
 
         elif l_paren := self.maybe("("):
             expr = self.parse_expr()
@@ -482,15 +504,14 @@ class Parser:
                 raise Stop(f"expected expression after '{l_paren.text}'", (l_paren,))
             r_paren = self.expect(")", error=Stop)
 
-            new_toks = (l_paren,) + expr.toks + (r_paren,)
-            return type(expr)(*expr.params, toks=new_toks)
+            return type(expr)(*expr.params, toks=(l_paren, r_paren))
 
         else:
             name_or_val = self.expect()
 
-            if VAL_RE.match(name_or_val.text):
-                return Val(str_to_int(name_or_val.text), toks=(name_or_val,))
-            elif NAME_RE.match(name_or_val.text):
+            if name_or_val.val is not None:
+                return Val(name_or_val.val, toks=(name_or_val,))
+            elif _is_name(name_or_val.text):
                 return Name(name_or_val.text, toks=(name_or_val,))
             else:
                 raise Reset(
@@ -508,51 +529,60 @@ class Parser:
             if y is None:
                 raise Stop(f"expected expression after '{op.text}' operator", (op,))
 
-            return BinExpr(x, op.text, y, toks=x.toks + (op,) + y.toks)
+            return BinExpr(x, op.text, y, toks=(x.toks[0], y.toks[-1]))
         else:
             return x
 
-    @cache_left_rec
     def parse_factor(self: Parser) -> Optional[Expr]:
-        if op := self.maybe("-", "~"):
+        if self.toks.peek().text in UN_OPS:
+            op = self.toks.get()
             x = self.parse_factor()
             if x is None:
                 raise Stop(f"expected expression after '{op.text}' operator", (op,))
 
-            return UnExpr(op.text, x, toks=(op,) + x.toks)
+            return UnExpr(op.text, x, toks=(op, x.toks[-1]))
 
         return self.parse_power()
 
+    def parse_bin_expr(self, min_prec: int) -> Optional[Expr]:
+        """
+        Parse a chain of binary operations whose operators have a precedence of
+        at least ``min_prec``.  This handles every binary operator level in a
+        single loop instead of recursing through one method per level.
+        """
+        x = self.parse_factor()
+        if x is None:
+            return None
+
+        # all binary operators are left-associative so there's no need for
+        # the left-recursive rules used in the grammar
+        while (prec := BIN_OP_PRECS.get(self.toks.peek().text, 0)) >= min_prec:
+            op = self.toks.get()
+
+            y = self.parse_bin_expr(prec + 1)
+            if y is None:
+                raise Stop(f"expected expression after '{op.text}' operator", (op,))
+
+            x = BinExpr(x, op.text, y, toks=(x.toks[0], y.toks[-1]))
+
+        return x
+
     @staticmethod
     def make_expr_parser(
-        name: str,
-        ops: Tuple[str, ...],
-        rhs: Callable[[Parser], Optional[Expr]],
+        name: str, min_prec: int
     ) -> Callable[[Parser], Optional[Expr]]:
         def parser(self: Parser) -> Optional[Expr]:
-            with self.reset():
-                if x := parser_(self):
-                    op = self.expect(*ops)
-
-                    y = rhs(self)
-                    if y is None:
-                        raise Stop(
-                            f"expected expression after '{op.text}' operator", (op,)
-                        )
-
-                    return BinExpr(x, op.text, y, toks=x.toks + (op,) + y.toks)
-
-            return rhs(self)
+            return self.parse_bin_expr(min_prec)
 
         parser.__name__ = name
 
-        parser_ = cache_left_rec(parser)
-
-        return parser_
+        return parser
 
-    parse_term = make_expr_parser("parse_term", ("*", "/", "%"), parse_factor)
-    parse_sum = make_expr_parser("parse_sum", ("+", "-"), parse_term)
-    parse_shift = make_expr_parser("parse_shift", ("<<", ">>"), parse_sum)
-    parse_and = make_expr_parser("parse_and", ("&",), parse_shift)
-    parse_xor = make_expr_parser("parse_xor", ("^",), parse_and)
-    parse_expr = make_expr_parser("parse_expr", ("|",), parse_xor)
+    parse_term = make_expr_parser("parse_term", BIN_OP_PRECS["*"])
+    parse_sum = make_expr_parser("parse_sum", BIN_OP_PRECS["+"])
+    parse_shift = make_expr_parser("parse_shift", BIN_OP_PRECS["<<"])
+    parse_and = make_expr_parser("parse_and", BIN_OP_PRECS["&"])
+    parse_xor = make_expr_parser("parse_xor", BIN_OP_PRECS["^"])
+    # the mnemonic parsers backtrack over the same leading expression so it's
+    # the only rule worth memoizing
+    parse_expr = cache_result(make_expr_parser("parse_expr", BIN_OP_PRECS["|"]))
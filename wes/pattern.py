@@ -1,34 +1,80 @@
 from __future__ import annotations
 
 from collections import deque
+from operator import attrgetter
 from typing import Any, Callable, Dict, Optional, Tuple
 
 from wes.exceptions import PatternError
 from wes.utils import SlotClass
 
 
+def _make_params_getter(names: Tuple[str, ...]) -> Callable[[Any], Tuple[Any, ...]]:
+    """
+    Return a function that gets the attributes in ``names`` from an object as
+    a tuple.
+    """
+    if len(names) == 0:
+        return lambda obj: ()
+    elif len(names) == 1:
+        get = attrgetter(names[0])
+        return lambda obj: (get(obj),)
+    else:
+        return attrgetter(*names)
+
+
+def _make_eq(names: Tuple[str, ...]) -> Callable[[Any, Any], bool]:
+    """
+    Return an ``__eq__`` function which checks that two objects have the same
+    type and equal values for the attributes in ``names``.  The comparisons are
+    generated as straight-line code so that no tuples are built for them.
+    """
+    cmps = "".join(f" and self.{n} == other.{n}" for n in names)
+    src = f"def __eq__(self, other):\n    return type(self) is type(other){cmps}\n"
+
+    ns: Dict[str, Any] = {}
+    exec(src, ns)
+
+    return ns["__eq__"]
+
+
 class Pattern(SlotClass):
     __slots__: Tuple[str, ...] = tuple()
 
     annotations: Tuple[str, ...] = tuple()
 
+    _get_params = staticmethod(_make_params_getter(()))
+    _generated_eq: Optional[Callable[[Any, Any], bool]] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+
+        # work out which slots hold parameters once per class instead of once
+        # per call to `params`
+        names = tuple(n for n in cls.__slots__ if n not in cls.annotations)
+        cls._get_params = staticmethod(_make_params_getter(names))  # type: ignore
+
+        # subclasses that customize `__eq__`, or inherit a customized `__eq__`,
+        # keep that definition.  A customized `equal` must still be used by
+        # `==` so it can't be bypassed by a generated `__eq__`.
+        if cls.__eq__ in (Pattern.__eq__, cls._generated_eq):
+            if cls.equal is Pattern.equal:
+                cls.__eq__ = cls._generated_eq = _make_eq(names)  # type: ignore
+            else:
+                cls.__eq__ = Pattern.__eq__  # type: ignore
+
     @property
     def params(self) -> Tuple[Any, ...]:
         """
         Return a tuple of parameters provided to a pattern.
         """
-        return tuple(
-            getattr(self, n) for n in self.__slots__ if n not in self.annotations
-        )
+        return self._get_params(self)
 
     def equal(self, p: Pattern) -> bool:
         """
         Return ``True`` if ``p`` should be considered an instance of *and* an
         equal parameterization of this pattern type.
         """
-        return (type(self) is type(p)) and all(
-            x == y for x, y in zip(self.params, p.params)
-        )
+        return type(self) is type(p) and self.params == p.params
 
     def unify(self, p: Pattern) -> Substitutions:
         """
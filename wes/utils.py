@@ -1,4 +1,4 @@
-from typing import Any, Dict, Iterator, Tuple
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 BASES = {
     "0b": 2,
@@ -14,6 +14,25 @@ def str_to_int(s: str) -> int:
     return int(s, base=base)
 
 
+def parse_int(s: str) -> Optional[int]:
+    """
+    Return the value of the integer literal ``s`` or ``None`` if ``s`` is not a
+    valid integer literal.
+    """
+    if not ("0" <= s[0] <= "9" and s.isascii()):
+        return None
+
+    # `int` accepts underscore digit grouping itself so the text is passed
+    # through as is.  Only literals starting with "0" can have a base prefix.
+    try:
+        if s[0] == "0":
+            return int(s, BASES.get(s[:2], 10))
+        else:
+            return int(s)
+    except ValueError:
+        return None
+
+
 def byte_length(i: int) -> int:
     return max(1, (i.bit_length() + 7) // 8)
 